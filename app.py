@@ -1,8 +1,10 @@
+import gc
+import io
 import os
-import tempfile
 import streamlit as st
 import pandas as pd
 import matplotlib.dates as mdates  # <-- NEW
+import matplotlib.pyplot as plt
 
 from src.data_core.reader import DataReader
 from src.data_core.adjustments import TableRefiner
@@ -19,6 +21,12 @@ from src.data_core.writer import TableWriter
 # --- plotting helper class ---
 from src.plot.data_plotter import DataPlotter
 
+# Column layouts of a finished table (either order), checked on every rerun
+_FINAL_LAYOUTS = frozenset([
+    ("moment", "consumption_kwh"),
+    ("consumption_kwh", "moment"),
+])
+
 
 # ==============================================================================
 # Session State
@@ -26,7 +34,7 @@ from src.plot.data_plotter import DataPlotter
 def init_state():
     defaults = {
         "step": 0,  # 0: upload, 1: preview+time select
-        "df_raw": None,  # raw upload (no changes)
+        "df_raw": None,  # raw upload (no changes): first + last 20 rows only
         "df_processed": None,
         "consumption_col": None,
         "time_candidates": [],
@@ -41,9 +49,10 @@ def init_state():
         "saved_path": None,
         "pipeline_summary": None,  # still stored, but not shown
 
-        # --- keep temp file across reruns (needed for multi-sheet pick) ---
-        "uploaded_temp_path": None,
-        "uploaded_file_name": None,
+        # --- preview caches (see _preview_bundle) ---
+        "raw_preview": None,
+        "final_preview": None,
+        "final_cleaned": None,  # the df_processed object that already went through the final cleanup
 
         # --- UI confirm gates (no dropdowns + must confirm) ---
         "time_cols_confirmed": False,
@@ -67,6 +76,7 @@ def init_state():
         "plot_wants": "No",  # "No" | "Yes"
         "random_week_info": None,  # dict or None
         "random_week_clicks": 0,
+        "plot_bundle": None,  # see _plot_bundle
     }
     for k, v in defaults.items():
         if k not in st.session_state:
@@ -77,15 +87,19 @@ def log(msg: str):
     st.session_state.log.append(msg)
 
 
-def _cleanup_uploaded_temp_if_exists():
-    temp_path = st.session_state.get("uploaded_temp_path")
-    if temp_path and os.path.exists(temp_path):
-        try:
-            os.remove(temp_path)
-        except Exception:
-            pass
-    st.session_state.uploaded_temp_path = None
-    st.session_state.uploaded_file_name = None
+def _preview_bundle(df: pd.DataFrame, key: str) -> dict:
+    # Head/tail slices, rebuilt only when `df` is a different object.
+    # Keyed on identity instead of st.cache_data: hashing a large DataFrame on every
+    # rerun would cost more than the slicing it saves.
+    cached = st.session_state.get(key)
+    if cached is None or cached["df"] is not df:
+        cached = {
+            "df": df,
+            "head": df.head(20),
+            "tail": df.tail(20),
+        }
+        st.session_state[key] = cached
+    return cached
 
 
 # --- NEW: format x-axis ticks as DD-MM-YYYY HH:MM ---
@@ -100,19 +114,59 @@ def _format_datetime_xaxis(fig):
     return fig
 
 
+def _close_figures(*holders):
+    # DataPlotter draws through plt.subplots, so pyplot keeps every figure alive
+    # until it is closed: close the ones we are about to drop from session_state.
+    for h in holders:
+        if not h:
+            continue
+        for key in ("full_fig", "fig"):
+            if h.get(key) is not None:
+                plt.close(h[key])
+        if h.get("last_info"):
+            _close_figures(h["last_info"])
+
+
+def _plot_bundle(df: pd.DataFrame) -> dict:
+    # DataPlotter + full-range figure, rebuilt only when `df` is a different object
+    # (same identity key as _preview_bundle). Reruns re-send the figures instead of
+    # re-grouping weeks and re-drawing; "last_info" is filled in on first use.
+    cached = st.session_state.get("plot_bundle")
+    if cached is None or cached["df"] is not df:
+        _close_figures(cached)
+        plotter = DataPlotter(df)
+        cached = {
+            "df": df,
+            "plotter": plotter,
+            "full_fig": _format_datetime_xaxis(plotter.plot_full()),
+            "last_info": None,
+        }
+        st.session_state.plot_bundle = cached
+    return cached
+
+
 # ==============================================================================
 # Core pipeline (automatic)
 # ==============================================================================
-def run_automatic_pipeline(file_path: str) -> dict:
-    reader = DataReader(file_path)
+@st.cache_data(show_spinner=False, max_entries=4, ttl=3600)
+def run_automatic_pipeline(file_bytes: bytes, suffix: str, sheet_name=None) -> dict:
+    # Cached on the uploaded bytes, so reruns with the same file skip the whole pipeline.
+    # The sheet is resolved by the caller: the sheet picker uses widgets, which must not
+    # run inside a cached function.
+    reader = DataReader.from_buffer(io.BytesIO(file_bytes), suffix, sheet_name=sheet_name)
     df_processed = reader.read_data()
 
     table = getattr(reader, "table", None)
     if table is None:
         table = df_processed
 
-    raw_table = table.copy()
-    raw_shape = raw_table.shape
+    # Step 1 only ever shows the first/last 20 raw rows, so keep just those
+    # (original row labels intact) instead of a full copy of the upload.
+    raw_shape = table.shape
+    if len(table) > 40:
+        raw_table = pd.concat([table.head(20), table.tail(20)]).copy()
+    else:
+        raw_table = table.copy()
 
     refiner1 = TableRefiner(table)
     refiner1.clean_table()
@@ -125,14 +179,19 @@ def run_automatic_pipeline(file_path: str) -> dict:
     header_shape = table.shape
 
     refiner2 = TableRefiner(table)
-    refiner2.clean_table()
+    refiner2.clean_table(stage="post_header")
     table = refiner2.table
     clean2_shape = table.shape
 
     cons_det = ConsumptionColumnDetector(table)
     consumption_col = cons_det.detect_consumption_column()
     _cons_kwh_series = cons_det.to_kwh()
-    final_table = cons_det.table
+
+    # Arrow strings only after consumption detection: pd.to_numeric on them gives
+    # double[pyarrow] NaN that .isna() does not count as missing
+    refiner3 = TableRefiner(cons_det.table)
+    refiner3.convert_to_arrow_dtypes()
+    final_table = refiner3.table
     final_shape = final_table.shape
 
     time_det = TimeColumnDetector(final_table)
@@ -157,6 +216,124 @@ def run_automatic_pipeline(file_path: str) -> dict:
     }
 
 
+# ==============================================================================
+# Final table sections (fragments)
+# ==============================================================================
+@st.fragment
+def _plot_section(df: pd.DataFrame):
+    # Fragment: the plot radio / random-week button rerun only this block,
+    # not the previews and time-column flow above it.
+    st.write("---")
+    st.subheader("Optional: Plot your unified data")
+
+    st.session_state.plot_wants = st.radio(
+        "Do you want to plot this data before downloading?",
+        options=["No", "Yes"],
+        index=0 if st.session_state.plot_wants != "Yes" else 1,
+        key="plot_wants_radio",
+    )
+
+    if st.session_state.plot_wants == "Yes":
+        try:
+            plot_bundle = _plot_bundle(df)
+            plotter = plot_bundle["plotter"]
+
+            st.markdown("#### Full time range")
+            fig_full = plot_bundle["full_fig"]
+            st.pyplot(fig_full, use_container_width=True)
+
+            total_weeks = plotter.total_weeks()
+            st.info(f"Total available weeks in this dataset: **{total_weeks}**")
+
+            st.markdown("#### Last week")
+            if plot_bundle["last_info"] is None:
+                last_info = plotter.plot_last_week()
+                last_info["fig"] = _format_datetime_xaxis(last_info["fig"])  # <-- NEW
+                plot_bundle["last_info"] = last_info
+            last_info = plot_bundle["last_info"]
+            st.info(
+                f"Plotting last week: **Week {last_info['week_index']} / {last_info.get('total_weeks', total_weeks)}** "
+                f"({last_info['start']} → {last_info['end']})"
+            )
+            st.pyplot(last_info["fig"], use_container_width=True)
+
+            c1, c2 = st.columns(2)
+            with c1:
+                if st.button("Plot another random week"):
+                    st.session_state.random_week_clicks += 1
+                    # plot_random_week redraws into the same figure, so the
+                    # previous one is not closed here
+                    st.session_state.random_week_info = plotter.plot_random_week()
+                    st.rerun(scope="fragment")
+
+            with c2:
+                st.button("Continue to download")
+
+            if st.session_state.random_week_info is not None:
+                info = st.session_state.random_week_info
+                st.markdown("#### Random week")
+                st.info(
+                    f"Randomly selected: **Week {info['week_index']} / {info.get('total_weeks', total_weeks)}** "
+                    f"({info['start']} → {info['end']})"
+                )
+                fig_rand = _format_datetime_xaxis(info["fig"])  # <-- NEW
+                st.pyplot(fig_rand, use_container_width=True)
+
+        except Exception as e:
+            st.error(f"Plotting failed: {e}")
+
+
+@st.fragment
+def _save_section(df: pd.DataFrame):
+    # Fragment: typing the table name or saving reruns only this block.
+    st.write("---")
+    st.info(
+        "Your final table is ready. To save it, please give your table a name.\n\n"
+        "Example formats:\n"
+        "- `ContractNumber_89578345`\n"
+        "- `ContractId_8458_7384djfnjd_`"
+    )
+
+    st.session_state.save_name = st.text_input(
+        "Table name (no extension):",
+        value=st.session_state.save_name,
+        placeholder="ContractNumber_89578345",
+    )
+
+    save_disabled = (st.session_state.save_name.strip() == "")
+
+    s1, s2, s3 = st.columns(3)
+    with s1:
+        if st.button("Save as Excel (.xlsx)", disabled=save_disabled):
+            try:
+                writer = TableWriter()
+                out_path = writer.save_xlsx(df, st.session_state.save_name.strip(), index=False)
+                st.session_state.saved_path = str(out_path)
+                st.success(f"Saved! File written to: `{st.session_state.saved_path}`")
+            except Exception as e:
+                st.error(f"Could not save file: {e}")
+
+    with s2:
+        if st.button("Save as CSV (.csv)", disabled=save_disabled):
+            try:
+                writer = TableWriter()
+                out_path = writer.save_csv(df, st.session_state.save_name.strip(), index=False)
+                st.session_state.saved_path = str(out_path)
+                st.success(f"Saved! File written to: `{st.session_state.saved_path}`")
+            except Exception as e:
+                st.error(f"Could not save file: {e}")
+
+    with s3:
+        if st.button("Save as Parquet (.parquet)", disabled=save_disabled):
+            try:
+                writer = TableWriter()
+                out_path = writer.save_parquet(df, st.session_state.save_name.strip(), index=False)
+                st.session_state.saved_path = str(out_path)
+                st.success(f"Saved! File written to: `{st.session_state.saved_path}`")
+            except Exception as e:
+                st.error(f"Could not save file: {e}")
+
+
 # ==============================================================================
 # UI
 # ==============================================================================
@@ -176,20 +353,13 @@ if st.session_state.step == 0:
 
     if uploaded_file:
         try:
-            if st.session_state.uploaded_file_name != uploaded_file.name:
-                _cleanup_uploaded_temp_if_exists()
+            suffix = os.path.splitext(uploaded_file.name)[-1].lower() or ".xlsx"
 
-            if st.session_state.uploaded_temp_path is None:
-                suffix = os.path.splitext(uploaded_file.name)[-1].lower() or ".xlsx"
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                    tmp.write(uploaded_file.getbuffer())
-                    st.session_state.uploaded_temp_path = tmp.name
-                st.session_state.uploaded_file_name = uploaded_file.name
-                log(f"Uploaded file saved to temp: {st.session_state.uploaded_temp_path}")
-
-            temp_path = st.session_state.uploaded_temp_path
-
-            results = run_automatic_pipeline(temp_path)
+            # Parsed straight from the in-memory upload (no temp file round-trip).
+            # The uploader reuses its buffer across reruns, so rewind it first.
+            uploaded_file.seek(0)
+            sheet_name = DataReader.from_buffer(uploaded_file, suffix).resolve_sheet_name()
+            results = run_automatic_pipeline(uploaded_file.getvalue(), suffix, sheet_name)
 
             st.session_state.df_raw = results["df_raw"]
             st.session_state.df_processed = results["df_processed"]
@@ -206,10 +376,12 @@ if st.session_state.step == 0:
 
             st.session_state.save_name = ""
             st.session_state.saved_path = None
+            st.session_state.final_cleaned = None
 
             st.session_state.plot_wants = "No"
             st.session_state.random_week_info = None
             st.session_state.random_week_clicks = 0
+            st.session_state.plot_bundle = None
 
             st.session_state.time_cols_confirmed = False
             st.session_state.time_selected_snapshot = []
@@ -228,8 +400,6 @@ if st.session_state.step == 0:
             st.session_state.date_col_snapshot = None
             st.session_state.time_col_snapshot = None
 
-            _cleanup_uploaded_temp_if_exists()
-
             st.session_state.step = 1
             st.rerun()
 
@@ -244,11 +414,12 @@ if st.session_state.step == 0:
 if st.session_state.step == 1:
     df_raw = st.session_state.df_raw
     if isinstance(df_raw, pd.DataFrame):
+        raw_preview = _preview_bundle(df_raw, "raw_preview")
         st.subheader("Original upload preview")
         st.write("### First 20 rows:")
-        st.dataframe(df_raw.head(20), use_container_width=True)
+        st.dataframe(raw_preview["head"], use_container_width=True)
         st.write("### Last 20 rows:")
-        st.dataframe(df_raw.tail(20), use_container_width=True)
+        st.dataframe(raw_preview["tail"], use_container_width=True)
 
     st.write("---")
     st.subheader("Consumption column")
@@ -329,26 +500,31 @@ if st.session_state.step == 1:
                 st.warning("Confirm the interpretation to proceed.")
             else:
                 if single_mode.startswith("It contains both date and hour information"):
-                    try:
-                        pref = Preference_SingleDateTime(df, datetime_col=single_col)
-                        pref.extract_date_and_hour()
-                        pref.create_moment_column()
-
-                        refiner2 = TableRefiner(pref.table)
-                        refiner2.keep_only_moment_and_consumption(
-                            moment_col="moment",
-                            consumption_col="consumption_kwh",
-                        )
-                        refiner2.drop_trailing_empty_rows()
-                        refiner2.drop_empty_columns()
-                        pref.table = refiner2.table
-
-                        st.session_state.df_processed = pref.table
-                        df = st.session_state.df_processed
-
+                    if st.session_state.final_cleaned is df:
+                        # Already normalized on an earlier rerun; df is the final table now.
                         st.success("Success! Your final table is ready.")
-                    except Exception as e:
-                        st.error(f"I couldn't normalize the single datetime column: {e}")
+                    else:
+                        try:
+                            pref = Preference_SingleDateTime(df, datetime_col=single_col)
+                            pref.extract_date_and_hour()
+                            pref.create_moment_column()
+
+                            refiner2 = TableRefiner(pref.table)
+                            refiner2.keep_only_moment_and_consumption(
+                                moment_col="moment",
+                                consumption_col="consumption_kwh",
+                            )
+                            refiner2.drop_trailing_empty_rows()
+                            refiner2.drop_empty_columns()
+                            pref.table = refiner2.table
+
+                            st.session_state.df_processed = pref.table
+                            st.session_state.final_cleaned = pref.table
+                            df = st.session_state.df_processed
+
+                            st.success("Success! Your final table is ready.")
+                        except Exception as e:
+                            st.error(f"I couldn't normalize the single datetime column: {e}")
 
         if st.session_state.time_cols_confirmed and len(st.session_state.time_selected) == 2:
             c1, c2 = st.session_state.time_selected
@@ -445,6 +621,9 @@ if st.session_state.step == 1:
 
                 if not st.session_state.date_hour_confirmed:
                     st.warning("Confirm date/hour to proceed with merging & parsing.")
+                elif st.session_state.final_cleaned is df:
+                    # Already merged on an earlier rerun; df is the final table now.
+                    st.success("Success! Your final table is ready.")
                 else:
                     try:
                         pref = Preference_Date_And_Hour(df, date_col=date_col, hour_col=hour_col)
@@ -462,6 +641,7 @@ if st.session_state.step == 1:
                         pref.table = refiner2.table
 
                         st.session_state.df_processed = pref.table
+                        st.session_state.final_cleaned = pref.table
                         df = st.session_state.df_processed
 
                         st.success("Success! Your final table is ready.")
@@ -483,125 +663,47 @@ if st.session_state.step == 1:
 
     final_ready = (
         isinstance(df, pd.DataFrame)
-        and set(df.columns) == {"moment", "consumption_kwh"}
-        and len(df) > 0
+        and not df.empty
+        and tuple(df.columns) in _FINAL_LAYOUTS
     )
 
-    if final_ready:
+    # The normalize branches already dropped trailing rows / empty columns;
+    # only clean here when df has not been through that yet.
+    if final_ready and st.session_state.final_cleaned is not df:
         try:
             ref_final = TableRefiner(df)
             ref_final.drop_trailing_empty_rows()
             ref_final.drop_empty_columns()
             df = ref_final.table
             st.session_state.df_processed = df
+            st.session_state.final_cleaned = df
         except Exception:
             pass
 
+    if final_ready:
+
         st.write("---")
         st.subheader("Final table preview")
 
+        final_preview = _preview_bundle(df, "final_preview")
+
         st.write("### First 20 rows:")
-        st.dataframe(df.head(20), use_container_width=True)
+        st.dataframe(final_preview["head"], use_container_width=True)
 
         st.write("### Last 20 rows:")
-        st.dataframe(df.tail(20), use_container_width=True)
+        st.dataframe(final_preview["tail"], use_container_width=True)
 
-        st.write("---")
-        st.subheader("Optional: Plot your unified data")
-
-        st.session_state.plot_wants = st.radio(
-            "Do you want to plot this data before downloading?",
-            options=["No", "Yes"],
-            index=0 if st.session_state.plot_wants != "Yes" else 1,
-            key="plot_wants_radio",
-        )
-
-        if st.session_state.plot_wants == "Yes":
-            try:
-                plotter = DataPlotter(df)
-
-                st.markdown("#### Full time range")
-                fig_full = plotter.plot_full()
-                fig_full = _format_datetime_xaxis(fig_full)  # <-- NEW
-                st.pyplot(fig_full, use_container_width=True)
+        _plot_section(df)
 
-                total_weeks = plotter.total_weeks()
-                st.info(f"Total available weeks in this dataset: **{total_weeks}**")
-
-                st.markdown("#### Last week")
-                last_info = plotter.plot_last_week()
-                last_info["fig"] = _format_datetime_xaxis(last_info["fig"])  # <-- NEW
-                st.info(
-                    f"Plotting last week: **Week {last_info['week_index']} / {last_info.get('total_weeks', total_weeks)}** "
-                    f"({last_info['start']} → {last_info['end']})"
-                )
-                st.pyplot(last_info["fig"], use_container_width=True)
-
-                c1, c2 = st.columns(2)
-                with c1:
-                    if st.button("Plot another random week"):
-                        st.session_state.random_week_clicks += 1
-                        st.session_state.random_week_info = plotter.plot_random_week()
-                        st.rerun()
-
-                with c2:
-                    st.button("Continue to download")
-
-                if st.session_state.random_week_info is not None:
-                    info = st.session_state.random_week_info
-                    st.markdown("#### Random week")
-                    st.info(
-                        f"Randomly selected: **Week {info['week_index']} / {info.get('total_weeks', total_weeks)}** "
-                        f"({info['start']} → {info['end']})"
-                    )
-                    fig_rand = _format_datetime_xaxis(info["fig"])  # <-- NEW
-                    st.pyplot(fig_rand, use_container_width=True)
-
-            except Exception as e:
-                st.error(f"Plotting failed: {e}")
-
-        st.write("---")
-        st.info(
-            "Your final table is ready. To save it, please give your table a name.\n\n"
-            "Example formats:\n"
-            "- `ContractNumber_89578345`\n"
-            "- `ContractId_8458_7384djfnjd_`"
-        )
-
-        st.session_state.save_name = st.text_input(
-            "Table name (no extension):",
-            value=st.session_state.save_name,
-            placeholder="ContractNumber_89578345",
-        )
-
-        save_disabled = (st.session_state.save_name.strip() == "")
-
-        s1, s2 = st.columns(2)
-        with s1:
-            if st.button("Save as Excel (.xlsx)", disabled=save_disabled):
-                try:
-                    writer = TableWriter()
-                    out_path = writer.save_xlsx(df, st.session_state.save_name.strip(), index=False)
-                    st.session_state.saved_path = str(out_path)
-                    st.success(f"Saved! File written to: `{st.session_state.saved_path}`")
-                except Exception as e:
-                    st.error(f"Could not save file: {e}")
-
-        with s2:
-            if st.button("Save as CSV (.csv)", disabled=save_disabled):
-                try:
-                    writer = TableWriter()
-                    out_path = writer.save_csv(df, st.session_state.save_name.strip(), index=False)
-                    st.session_state.saved_path = str(out_path)
-                    st.success(f"Saved! File written to: `{st.session_state.saved_path}`")
-                except Exception as e:
-                    st.error(f"Could not save file: {e}")
+        _save_section(df)
 
     st.write("---")
 
     colA, colB = st.columns(2)
     with colA:
         if st.button("Back to upload"):
+            _close_figures(st.session_state.plot_bundle, st.session_state.random_week_info)
+
             st.session_state.step = 0
             st.session_state.df_raw = None
             st.session_state.df_processed = None
@@ -616,10 +718,14 @@ if st.session_state.step == 1:
             st.session_state.save_name = ""
             st.session_state.saved_path = None
             st.session_state.pipeline_summary = None
+            st.session_state.raw_preview = None
+            st.session_state.final_preview = None
+            st.session_state.final_cleaned = None
 
             st.session_state.plot_wants = "No"
             st.session_state.random_week_info = None
             st.session_state.random_week_clicks = 0
+            st.session_state.plot_bundle = None
 
             st.session_state.time_cols_confirmed = False
             st.session_state.time_selected_snapshot = []
@@ -638,7 +744,10 @@ if st.session_state.step == 1:
             st.session_state.date_col_snapshot = None
             st.session_state.time_col_snapshot = None
 
-            _cleanup_uploaded_temp_if_exists()
+            # Figures and frames hold reference cycles: free them now rather than
+            # at some later GC pass, before the next upload comes in.
+            gc.collect()
+
             st.rerun()
 
     with colB:
@@ -1,7 +1,21 @@
 import pandas as pd
+import codecs
+import hashlib
 import os
 import csv
 
+# Rust-based XLSX/XLS parser; several times faster than pandas' defaults
+# (openpyxl / xlrd). Falls back to those when python-calamine is not installed.
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
+# Opt-in: FAST_IO=1 parses CSV with pyarrow's multithreaded reader first
+# (falls back to pandas for anything it cannot read the same way).
+FAST_IO = os.environ.get("FAST_IO", "0") == "1"
+
 
 class DataReader:
     """
@@ -14,25 +28,124 @@ class DataReader:
       it will ask the user to pick a sheet, preview first/last 20 rows, and require
       confirmation before continuing.
     - If not running in Streamlit, it will raise a ValueError asking for sheet_name.
+    - `file_path` may also be an in-memory buffer (e.g. BytesIO); use `from_buffer`
+      so the file type is known without a file name.
     """
 
-    def __init__(self, file_path, sheet_name=None):
-        self.file_path = file_path
-        self.file_extension = os.path.splitext(file_path)[1].lower()
+    def __init__(self, file_path, sheet_name=None, file_extension=None):
+        self.file_path = file_path  # path or binary file-like object
+        self.file_extension = (file_extension or os.path.splitext(file_path)[1]).lower()
         self.sheet_name = sheet_name  # str/int/None
         self.table = None
 
+    @classmethod
+    def from_buffer(cls, buffer, suffix: str, sheet_name=None) -> "DataReader":
+        """
+        Build a reader over an in-memory binary buffer (e.g. an uploaded file),
+        skipping the round-trip through a temp file on disk.
+
+        `suffix` is the original file extension (".xlsx", ".xls", ".csv").
+        """
+        return cls(buffer, sheet_name=sheet_name, file_extension=suffix)
+
+    def _is_buffer(self) -> bool:
+        return hasattr(self.file_path, "read")
+
+    def _rewind(self) -> None:
+        """Move a buffer source back to its start before each full read."""
+        if self._is_buffer():
+            self.file_path.seek(0)
+
+    def _content_fingerprint(self) -> str:
+        """
+        Identify the file's content: a hash of the bytes for a buffer,
+        path + size + modification time for a file on disk.
+        """
+        if self._is_buffer():
+            if hasattr(self.file_path, "getvalue"):
+                data = self.file_path.getvalue()
+            else:
+                self._rewind()
+                data = self.file_path.read()
+                self._rewind()
+            return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+        info = os.stat(self.file_path)
+        return f"{os.path.abspath(self.file_path)}:{info.st_size}:{info.st_mtime_ns}"
+
+    def _excel_engine(self):
+        """
+        Engine for pd.read_excel / pd.ExcelFile.
+        XLSX and legacy XLS both use calamine when available.
+        """
+        return EXCEL_ENGINE or self._fallback_excel_engine()
+
+    def _fallback_excel_engine(self):
+        """Pure-Python engine used without calamine: openpyxl (XLSX) or xlrd (XLS)."""
+        if self.file_extension == ".xlsx":
+            return "openpyxl"
+        return None
+
+    def _read_excel(self, sheet_name) -> pd.DataFrame:
+        """
+        Read one sheet with header=None.
+
+        If calamine fails on a workbook (it is stricter about some malformed
+        files), retry once with the pure-Python engine before giving up.
+        """
+        engine = self._excel_engine()
+        try:
+            self._rewind()
+            return pd.read_excel(
+                self.file_path,
+                sheet_name=sheet_name,
+                skiprows=0,
+                header=None,
+                engine=engine,
+            )
+        except Exception:
+            if engine != "calamine":
+                raise
+
+        self._rewind()
+        return pd.read_excel(
+            self.file_path,
+            sheet_name=sheet_name,
+            skiprows=0,
+            header=None,
+            engine=self._fallback_excel_engine(),
+        )
+
+    def _read_head_bytes(self, sample_bytes: int) -> bytes:
+        """Read the first `sample_bytes` raw bytes of the source (once)."""
+        if self._is_buffer():
+            self._rewind()
+            raw = self.file_path.read(sample_bytes)
+            self._rewind()
+            return raw
+
+        with open(self.file_path, "rb") as f:
+            return f.read(sample_bytes)
+
     def _detect_csv_separator(self, sample_bytes: int = 65536) -> str:
         """
         Detect CSV delimiter by sampling the file content.
         Tries csv.Sniffer first; falls back to common delimiters.
+
+        The head of the file is read once; each candidate encoding decodes
+        that same sample in memory.
         """
         encodings_to_try = ["utf-8-sig", "utf-8", "cp1252", "latin1"]
 
+        try:
+            head = self._read_head_bytes(sample_bytes)
+        except Exception:
+            return ","
+
         for enc in encodings_to_try:
             try:
-                with open(self.file_path, "r", encoding=enc, newline="") as f:
-                    sample = f.read(sample_bytes)
+                # Incremental decoder tolerates a multi-byte char cut off at the sample end
+                sample = codecs.getincrementaldecoder(enc)().decode(head)
 
                 if not sample.strip():
                     return ","
@@ -51,8 +164,19 @@ class DataReader:
         return ","
 
     def _get_excel_sheet_names(self) -> list:
+        engine = self._excel_engine()
+        try:
+            self._rewind()
+            xls = pd.ExcelFile(self.file_path, engine=engine)
+            return list(xls.sheet_names or [])
+        except Exception as e:
+            if engine != "calamine":
+                raise ValueError(f"Could not inspect Excel sheets: {e}")
+
+        # calamine could not open it; retry with the pure-Python engine (see _read_excel)
         try:
-            xls = pd.ExcelFile(self.file_path)
+            self._rewind()
+            xls = pd.ExcelFile(self.file_path, engine=self._fallback_excel_engine())
             return list(xls.sheet_names or [])
         except Exception as e:
             raise ValueError(f"Could not inspect Excel sheets: {e}")
@@ -78,14 +202,17 @@ class DataReader:
         sig_key = f"{base}_signature"
         selected_key = f"{base}_selected"
         confirmed_key = f"{base}_confirmed"
+        preview_key = f"{base}_preview"
 
-        signature = tuple(sheet_names)
+        # Same sheet names do not mean the same workbook: include the content
+        signature = (self._content_fingerprint(), tuple(sheet_names))
 
-        # Reset if this is a different workbook (different sheet list)
+        # Reset if this is a different workbook (different content or sheet list)
         if st.session_state.get(sig_key) != signature:
             st.session_state[sig_key] = signature
             st.session_state[selected_key] = sheet_names[0] if sheet_names else None
             st.session_state[confirmed_key] = False
+            st.session_state[preview_key] = None
 
         st.warning("I found multiple sheets in this Excel file.")
         st.write("Which sheet should I use?")
@@ -102,18 +229,20 @@ class DataReader:
             st.session_state[selected_key] = selected
             st.session_state[confirmed_key] = False
 
-        # Preview selected sheet (first 20 + last 20)
+        # Preview selected sheet (first 20 + last 20). Only those rows are kept,
+        # so reruns (e.g. the confirm click) don't parse the whole sheet again.
         try:
-            preview_df = pd.read_excel(
-                self.file_path,
-                sheet_name=st.session_state[selected_key],
-                skiprows=0,
-                header=None,
-            )
+            cached = st.session_state.get(preview_key)
+            wanted = (signature, st.session_state[selected_key])
+            if cached is None or cached[0] != wanted:
+                preview_df = self._read_excel(st.session_state[selected_key])
+                cached = (wanted, preview_df.head(20), preview_df.tail(20))
+                st.session_state[preview_key] = cached
+            _, head, tail = cached
             st.write("### Preview (first 20 rows):")
-            st.dataframe(preview_df.head(20), use_container_width=True)
+            st.dataframe(head, use_container_width=True)
             st.write("### Preview (last 20 rows):")
-            st.dataframe(preview_df.tail(20), use_container_width=True)
+            st.dataframe(tail, use_container_width=True)
         except Exception as e:
             st.error(f"Could not preview the selected sheet: {e}")
             st.stop()
@@ -127,6 +256,89 @@ class DataReader:
 
         return st.session_state[selected_key]
 
+    def resolve_sheet_name(self):
+        """
+        Decide which Excel sheet `read_data` will load.
+
+        - If `sheet_name` is provided, returns it.
+        - If the workbook has a single sheet, returns that sheet.
+        - If there are multiple sheets, runs the Streamlit sheet picker
+          (or raises ValueError outside Streamlit).
+        - Returns None for non-Excel files.
+        """
+        if self.file_extension not in [".xlsx", ".xls"]:
+            return None
+
+        if self.sheet_name is not None:
+            return self.sheet_name
+
+        sheet_names = self._get_excel_sheet_names()
+        if not sheet_names:
+            raise ValueError("No sheets found in the Excel file.")
+
+        if len(sheet_names) == 1:
+            return sheet_names[0]
+
+        return self._maybe_streamlit_sheet_picker(sheet_names)
+
+    def _read_csv_arrow(self, sep: str):
+        """
+        Read the CSV with pyarrow.csv (header=None, like the pandas path).
+        Returns None if pyarrow is missing or cannot parse the file.
+
+        Columns Arrow would infer as timestamp/date/time/bool are kept as strings,
+        so the result matches pandas' header=None read (integer column labels,
+        NaN for empty cells) and the time helpers see the original text.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+        except ImportError:
+            return None
+
+        parse_options = pacsv.ParseOptions(delimiter=sep)
+
+        for enc in ["utf-8", "cp1252", "latin1"]:
+            read_options = pacsv.ReadOptions(
+                autogenerate_column_names=True,
+                encoding=enc,
+                use_threads=True,
+                block_size=8 << 20,
+            )
+            try:
+                # Peek at the inferred schema (first block) to pin non-numeric types
+                self._rewind()
+                schema = pacsv.open_csv(
+                    self.file_path, read_options=read_options, parse_options=parse_options
+                ).schema
+                as_text = {
+                    f.name: pa.string()
+                    for f in schema
+                    if pa.types.is_temporal(f.type) or pa.types.is_boolean(f.type)
+                }
+
+                self._rewind()
+                at = pacsv.read_csv(
+                    self.file_path,
+                    read_options=read_options,
+                    parse_options=parse_options,
+                    convert_options=pacsv.ConvertOptions(
+                        column_types=as_text,
+                        strings_can_be_null=True,
+                    ),
+                )
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, UnicodeDecodeError):
+                continue
+
+            if any(pa.types.is_binary(f.type) for f in at.schema):
+                continue  # bytes that are not valid text in this encoding
+
+            df = at.to_pandas()
+            df.columns = range(df.shape[1])
+            return df
+
+        return None
+
     def read_data(self):
         """
         Reads the data using the appropriate Pandas function based on file extension.
@@ -139,47 +351,31 @@ class DataReader:
             - Outside Streamlit: raises ValueError asking for sheet_name.
         """
         if self.file_extension in [".xlsx", ".xls"]:
-            if self.sheet_name is not None:
-                self.table = pd.read_excel(
-                    self.file_path,
-                    sheet_name=self.sheet_name,
-                    skiprows=0,
-                    header=None,
-                )
-            else:
-                sheet_names = self._get_excel_sheet_names()
-                if not sheet_names:
-                    raise ValueError("No sheets found in the Excel file.")
-
-                if len(sheet_names) == 1:
-                    self.table = pd.read_excel(
-                        self.file_path,
-                        sheet_name=sheet_names[0],
-                        skiprows=0,
-                        header=None,
-                    )
-                else:
-                    chosen_sheet = self._maybe_streamlit_sheet_picker(sheet_names)
-                    self.table = pd.read_excel(
-                        self.file_path,
-                        sheet_name=chosen_sheet,
-                        skiprows=0,
-                        header=None,
-                    )
+            chosen_sheet = self.resolve_sheet_name()
+            self.table = self._read_excel(chosen_sheet)
 
         elif self.file_extension == ".csv":
             sep = self._detect_csv_separator()
 
+            if FAST_IO:
+                self.table = self._read_csv_arrow(sep)
+                if self.table is not None and not self.table.empty:
+                    return self.table
+
             encodings_to_try = ["utf-8-sig", "utf-8", "cp1252", "latin1"]
             last_err = None
             for enc in encodings_to_try:
                 try:
+                    self._rewind()
                     self.table = pd.read_csv(
                         self.file_path,
                         sep=sep,
                         header=None,
                         encoding=enc,
-                        engine="python",
+                        # C tokenizer, much faster than the python engine. Floats go
+                        # through pandas' default converter, not Python's float(),
+                        # so a few decimals may differ from float() in the last bit.
+                        engine="c",
                     )
                     last_err = None
                     break
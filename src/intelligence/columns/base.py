@@ -1,4 +1,6 @@
 import re
+from functools import lru_cache
+
 import pandas as pd
 
 
@@ -14,9 +16,11 @@ class BaseColumnDetector:
         self.columns = list(table.columns)
 
     @staticmethod
+    @lru_cache(maxsize=1024, typed=True)
     def _norm(name: str) -> str:
         """
         Normalize a column name for comparison.
+        Cached: the detectors normalize the same names several times per column.
 
         - Convert to lowercase
         - Replace common separators with spaces
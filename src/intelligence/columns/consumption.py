@@ -1,3 +1,4 @@
+import re
 from typing import Optional
 
 import pandas as pd
@@ -21,6 +22,16 @@ class ConsumptionColumnDetector(BaseColumnDetector):
         "kwh",
     ]
 
+    # All keywords fused into one pattern: a single scan per column name
+    _CONSUMPTION_RE = re.compile("|".join(map(re.escape, CONSUMPTION_KEYWORDS)))
+
+    # Multiplier to kWh per detected unit (kW readings are quarter-hourly: / 4).
+    # Units without an entry (None) are taken as kWh.
+    UNIT_TO_KWH = {
+        "kwh": 1.0,
+        "kw": 0.25,
+    }
+
     def __init__(self, table: pd.DataFrame):
         """
         Parameters
@@ -50,7 +61,19 @@ class ConsumptionColumnDetector(BaseColumnDetector):
         Check if the column name looks consumption-related.
         """
         n = self._norm(name)
-        return any(keyword in n for keyword in self.CONSUMPTION_KEYWORDS)
+        return self._CONSUMPTION_RE.search(n) is not None
+
+    @staticmethod
+    def _to_numeric(series: pd.Series) -> pd.Series:
+        """
+        pd.to_numeric(errors="coerce"), with Arrow-backed results turned into
+        NumPy dtypes: on double[pyarrow], the NaN from unparseable text is not
+        counted by .isna().
+        """
+        coerced = pd.to_numeric(series, errors="coerce")
+        if isinstance(coerced.dtype, pd.ArrowDtype):
+            coerced = coerced.astype("float64")
+        return coerced
 
     def _numeric_likeness_score(self, series: pd.Series) -> int:
         """
@@ -66,7 +89,7 @@ class ConsumptionColumnDetector(BaseColumnDetector):
         if is_numeric_dtype(series):
             return 2
 
-        coerced = pd.to_numeric(series, errors="coerce")
+        coerced = self._to_numeric(series)
         non_na_ratio = coerced.notna().mean()
 
         if non_na_ratio >= 0.8:  # threshold can be tuned
@@ -153,21 +176,24 @@ class ConsumptionColumnDetector(BaseColumnDetector):
         col = self.consumption_column
         unit = self.consumption_unit
 
-        series = pd.to_numeric(self.table[col], errors="coerce")
+        series = self._to_numeric(self.table[col])
 
         if series.isna().all():
             raise ValueError(
                 f"Column '{col}' cannot be converted to numeric values."
             )
 
-        if unit == "kw":
-            series = series / 4.0
-        elif unit is None:
+        if unit is None:
             print(
                 f"Warning: No explicit unit found for column '{col}'. "
                 "Assuming values are already in kWh."
             )
 
+        # One vectorized multiply; kWh columns skip the copy entirely
+        factor = self.UNIT_TO_KWH.get(unit, 1.0)
+        if factor != 1.0:
+            series = series * factor
+
         # Store in the table as a standardized kWh column
         self.table[new_column_name] = series
 
@@ -1,15 +1,14 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import List
+import numpy as np
 import pandas as pd
 import re
 
 from .base import BaseColumnDetector
 
 
-from typing import Optional
-
-
 # ==============================================================================
 # 1) Detector
 # ==============================================================================
@@ -33,23 +32,160 @@ class TimeColumnDetector(BaseColumnDetector):
         "ab",
     ]
 
+    # All keywords fused into one pattern: a single scan per column name
+    _TIME_RE = re.compile("|".join(map(re.escape, TIME_KEYWORDS)))
+
     def __init__(self, table: pd.DataFrame) -> None:
         super().__init__(table)
 
     def _has_time_keyword(self, name: str) -> bool:
         n = self._norm(name)
-        return any(keyword in n for keyword in self.TIME_KEYWORDS)
+        return self._TIME_RE.search(n) is not None
 
     def detect_time_columns(self) -> List[str]:
         return [col for col in self.columns if self._has_time_keyword(col)]
 
 
 # ==============================================================================
-# 2) Date + Hour -> Single timestamp
+# Shared parsing helper
 # ==============================================================================
-import re
-import pandas as pd
+def _to_datetime_by_formats(s: pd.Series, formats, *, dayfirst: bool = True) -> pd.Series:
+    """
+    Parse `s` to datetime64[ns] by trying explicit formats in order.
+
+    Each format is one vectorized pass over the rows still unparsed, which is far
+    faster than format="mixed" (parsed element by element). Whatever is left
+    goes through format="mixed" with the given `dayfirst`. Unparseable values
+    become NaT.
+
+    Formats that parse the first non-null value are tried first, so a uniform
+    column (the usual case) is done in one pass instead of several failed ones.
+    The formats do not overlap, so the order does not change the result.
+    """
+    out = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    present = s.notna().to_numpy()
+    todo = present
+
+    if present.any():
+        sample = str(s[present].iloc[0]).strip()
+
+        def _fits(fmt) -> bool:
+            try:
+                datetime.strptime(sample, fmt)
+                return True
+            except ValueError:
+                return False
+
+        formats = sorted(formats, key=lambda fmt: not _fits(fmt))  # stable
+
+    for fmt in formats:
+        if not todo.any():
+            return out
+        parsed = pd.to_datetime(s[todo], format=fmt, errors="coerce", cache=True)
+        out[todo] = parsed.to_numpy()
+        todo = present & out.isna().to_numpy()
+
+    if todo.any():
+        try:
+            parsed = pd.to_datetime(
+                s[todo], format="mixed", dayfirst=dayfirst, errors="coerce", cache=True
+            )
+        except (ValueError, TypeError):
+            return out
+        if pd.api.types.is_datetime64_any_dtype(parsed):
+            if getattr(parsed.dt, "tz", None) is not None:
+                parsed = parsed.dt.tz_localize(None)
+            out[todo] = parsed.to_numpy()
+
+    return out
+
+
+# Leading "a<sep>b<sep>year" date, where a/b are day/month in some order
+_NUMERIC_DATE = re.compile(r"^\s*(?P<a>\d{1,2})(?P<sep>[./-])(?P<b>\d{1,2})(?P=sep)\d{2,4}")
+
+
+def _date_order(s: pd.Series):
+    """
+    Decide once for the whole column whether numeric dates are day-first.
+
+    Day-first if any date uses '.' (DE style) or has a first field above 12,
+    or if nothing tells the order apart; month-first if some second field is
+    above 12. Returns (dayfirst, mask of rows whose fields contradict that
+    order), so no row is parsed with the other order on its own.
+    """
+    # Only the leading date (at most 10 chars) matters, and dates repeat a lot
+    # (also inside unique timestamps): inspect each distinct date text once
+    codes, uniques = pd.factorize(s.astype("string").str.lstrip().str.slice(0, 10))
+    parts = pd.Series(uniques, dtype="string").str.extract(_NUMERIC_DATE)
+    a = pd.to_numeric(parts["a"]).fillna(0)
+    b = pd.to_numeric(parts["b"]).fillna(0)
+
+    dayfirst = bool((parts["sep"] == ".").any() or (a > 12).any() or not (b > 12).any())
+    wrong = (b > 12) if dayfirst else (a > 12)
+    # code -1 (missing input) picks the trailing False
+    return dayfirst, np.append(wrong.to_numpy(dtype=bool), False)[codes]
+
+
+def _formats_for_order(formats, dayfirst: bool) -> list:
+    """
+    `formats` as given for day-first columns; for month-first columns the
+    '/' and '-' day-first formats become month-first ('.' stays day-first).
+    """
+    if dayfirst:
+        return list(formats)
+    return [f.replace("%d/%m/", "%m/%d/").replace("%d-%m-", "%m-%d-") for f in formats]
+
+
+# HOUR text after separators were normalized to ':'
+_HOUR_SEPARATED = r"^(?P<h>\d+):(?P<m>\d+)(?::(?P<s>\d+))?"
+_HOUR_COMPACT = (
+    r"^(?:(?P<h6>\d{2})(?P<m6>\d{2})(?P<s6>\d{2})"  # HHMMSS
+    r"|(?P<h4>\d{2})(?P<m4>\d{2})"  # HHMM
+    r"|(?P<h3>\d)(?P<m3>\d{2})"  # HMM -> 9:30
+    r"|(?P<h1>\d{1,2}))$"  # H / HH
+)
+
 
+def _to_hhmmss(txt: pd.Series) -> pd.Series:
+    """
+    Normalize time-ish text to "HH:MM:SS" strings (vectorized .str ops).
+    Accepts:
+      - "0:15", "00:15", "00:15:00"
+      - "0015", "015", "000000" (digits only)
+      - "00-15-00" (non-digits treated as separators)
+    Values that cannot be parsed/validated become <NA>.
+    """
+    # normalize any run of non-digits to a single ':' separator
+    txt = txt.astype("string").str.strip()
+    txt = txt.str.replace(r"[^\d]+", ":", regex=True).str.strip(":")
+
+    # separators -> H:M(:S); extra parts are ignored
+    sep = txt.str.extract(_HOUR_SEPARATED)
+    # no separators -> HHMMSS / HHMM / HMM / HH / H
+    compact = txt.str.extract(_HOUR_COMPACT)
+
+    hh = sep["h"].fillna(compact["h6"]).fillna(compact["h4"])
+    hh = hh.fillna(compact["h3"]).fillna(compact["h1"])
+    mm = sep["m"].fillna(compact["m6"]).fillna(compact["m4"]).fillna(compact["m3"])
+    ss = sep["s"].fillna(compact["s6"])
+
+    found = hh.notna()
+    h = pd.to_numeric(hh, errors="coerce")
+    m = pd.to_numeric(mm, errors="coerce").fillna(0)
+    sec = pd.to_numeric(ss, errors="coerce").fillna(0)
+
+    valid = found & h.between(0, 23) & m.between(0, 59) & sec.between(0, 59)
+
+    def _pad(x: pd.Series) -> pd.Series:
+        return x.where(valid).astype("Int64").astype("string").str.zfill(2)
+
+    out = _pad(h) + ":" + _pad(m) + ":" + _pad(sec)
+    return out.astype("string")
+
+
+# ==============================================================================
+# 2) Date + Hour -> Single timestamp
+# ==============================================================================
 
 class Preference_Date_And_Hour:
     """
@@ -63,6 +199,18 @@ class Preference_Date_And_Hour:
       - Combine into a single datetime column named "moment"
     """
 
+    # Tried in order before the slow format="mixed" fallback (day-first, as in DE/EU exports;
+    # month-first columns swap the '/' and '-' ones, see _formats_for_order)
+    DATE_FORMATS = [
+        "%d.%m.%Y",
+        "%Y-%m-%d",
+        "%d/%m/%Y",
+        "%d-%m-%Y",
+        "%Y/%m/%d",
+        "%d.%m.%y",
+        "%Y-%m-%d %H:%M:%S",
+    ]
+
     def __init__(self, table: pd.DataFrame, date_col: str, hour_col: str):
         self.table = table
         self.date_col = date_col
@@ -85,7 +233,10 @@ class Preference_Date_And_Hour:
 
         # string/object -> parse -> normalize -> YYYY-MM-DD string
         if pd.api.types.is_string_dtype(s) or pd.api.types.is_object_dtype(s):
-            parsed = pd.to_datetime(s, errors="coerce")
+            dayfirst, wrong = _date_order(s)
+            formats = _formats_for_order(self.DATE_FORMATS, dayfirst)
+
+            parsed = _to_datetime_by_formats(s.where(~wrong), formats, dayfirst=dayfirst)
             if parsed.notna().sum() == 0 and s.dropna().shape[0] > 0:
                 raise ValueError(
                     f"Could not parse any values in DATE column '{self.date_col}' as datetime."
@@ -114,62 +265,16 @@ class Preference_Date_And_Hour:
             self.table[self.hour_col] = s.dt.strftime("%H:%M:%S").astype("string")
             return "string"
 
-        # string/object -> parse by rules
+        # string/object -> parse by rules (vectorized .str ops, no per-row Python)
         if pd.api.types.is_string_dtype(s) or pd.api.types.is_object_dtype(s):
-
-            def _to_hhmmss(v):
-                if pd.isna(v):
-                    return pd.NA
-
-                txt = str(v).strip()
-                if txt == "":
-                    return pd.NA
-
-                # normalize separators to ':'
-                txt2 = re.sub(r"[^\d]+", ":", txt)
-                txt2 = re.sub(r":+", ":", txt2).strip(":")
-
-                parts = txt2.split(":") if ":" in txt2 else [txt2]
-
-                # no separators -> HHMMSS / HHMM / HMM / H / HH
-                if len(parts) == 1:
-                    digits = parts[0]
-                    if not digits.isdigit():
-                        return pd.NA
-
-                    if len(digits) == 6:      # HHMMSS
-                        hh, mm, ss = digits[:2], digits[2:4], digits[4:6]
-                    elif len(digits) == 4:    # HHMM
-                        hh, mm, ss = digits[:2], digits[2:4], "00"
-                    elif len(digits) == 3:    # HMM -> 9:30
-                        hh, mm, ss = digits[:1], digits[1:3], "00"
-                    elif len(digits) == 2:    # HH
-                        hh, mm, ss = digits, "00", "00"
-                    elif len(digits) == 1:    # H
-                        hh, mm, ss = digits, "00", "00"
-                    else:
-                        return pd.NA
-                else:
-                    # separators -> H:M(:S)
-                    if len(parts) == 2:
-                        hh, mm = parts
-                        ss = "00"
-                    else:
-                        hh, mm, ss = parts[0], parts[1], parts[2]
-
-                try:
-                    h = int(hh)
-                    m = int(mm)
-                    sec = int(ss)
-                except Exception:
-                    return pd.NA
-
-                if not (0 <= h <= 23 and 0 <= m <= 59 and 0 <= sec <= 59):
-                    return pd.NA
-
-                return f"{h:02d}:{m:02d}:{sec:02d}"
-
-            self.table[self.hour_col] = s.map(_to_hhmmss).astype("string")
+            # An hour column repeats a handful of values (96 for quarter-hours):
+            # parse each distinct text once, then map the results back by code.
+            codes, uniques = pd.factorize(s.astype("string").str.strip())
+            out = _to_hhmmss(pd.Series(uniques, dtype="string"))
+
+            # code -1 (missing input) picks the trailing NA
+            out = np.append(out.to_numpy(dtype=object), pd.NA)[codes]
+            self.table[self.hour_col] = pd.Series(out, index=s.index, dtype="string")
             return "string"
 
         raise TypeError(
@@ -190,8 +295,13 @@ class Preference_Date_And_Hour:
         date_s = self.table[self.date_col].astype("string")
         hour_s = self.table[self.hour_col].astype("string")
 
-        combined = (date_s + " " + hour_s).astype("string")
-        dt = pd.to_datetime(combined, errors="coerce", format="%Y-%m-%d %H:%M:%S")
+        # Parse date and hour separately and add them: each side repeats a lot
+        # (days x 96 quarter-hours), so cache=True parses every distinct value
+        # once, instead of parsing one unique concatenated string per row.
+        # Hours are still validated strictly as HH:MM:SS (00-23 / 00-59 / 00-59).
+        dates = pd.to_datetime(date_s, errors="coerce", format="%Y-%m-%d", cache=True)
+        hours = pd.to_datetime(hour_s, errors="coerce", format="%H:%M:%S", cache=True)
+        dt = dates + (hours - pd.Timestamp("1900-01-01"))
 
         self.table[out_col] = dt
         return float(dt.notna().mean()) if len(dt) else 0.0
@@ -218,6 +328,20 @@ class Preference_SingleDateTime:
     # Time like 00:15 or 0:15 or 00:15:00 (also allows '.' as separator)
     _TIME = re.compile(r"(?P<h>\d{1,2})[:.](?P<mi>\d{2})(?:[:.](?P<s>\d{2}))?")
 
+    # Tried in order before the slow format="mixed" fallback (day-first;
+    # month-first columns swap the '/' ones, see _formats_for_order)
+    CANDIDATE_FORMATS = [
+        "%d.%m.%Y %H:%M:%S",
+        "%d.%m.%Y, %H:%M:%S",
+        "%d.%m.%Y %H:%M",
+        "%d.%m.%Y, %H:%M",
+        "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%d %H:%M",
+        "%Y-%m-%dT%H:%M:%S",
+        "%d/%m/%Y %H:%M:%S",
+        "%d/%m/%Y %H:%M",
+    ]
+
     def __init__(
         self,
         table: pd.DataFrame,
@@ -232,66 +356,46 @@ class Preference_SingleDateTime:
         self.hour_col_out = hour_col_out
         self.out_col = out_col
 
-    @staticmethod
-    def _century_fix(y: int) -> int:
-        # 2-digit years heuristic: 00-69 -> 2000-2069, 70-99 -> 1970-1999
-        if y < 100:
-            return 2000 + y if y <= 69 else 1900 + y
-        return y
-
-    @staticmethod
-    def _to_hhmmss(txt: str) -> Optional[str]:
+    def _extract_parts(self, txt: pd.Series, dayfirst: bool = True):
         """
-        Normalize time-ish text to HH:MM:SS.
-        Accepts:
-          - "0:15", "00:15", "00:15:00"
-          - "0015", "015", "000000" (digits only)
-          - "00-15-00" (non-digits treated as separators)
-        Returns None if cannot parse/validate.
+        Regex-based extraction of ("YYYY-MM-DD", "HH:MM:SS") strings from text
+        values (vectorized). Either part is <NA> if it cannot be found/validated.
+        With dayfirst=False the DMY pattern is read month-first.
         """
-        if txt is None:
-            return None
-        t = str(txt).strip()
-        if t == "":
-            return None
-
-        # normalize any non-digit to ':'
-        t2 = re.sub(r"[^\d]+", ":", t)
-        t2 = re.sub(r":+", ":", t2).strip(":")
-        parts = t2.split(":") if ":" in t2 else [t2]
-
-        if len(parts) == 1:
-            digits = parts[0]
-            if not digits.isdigit():
-                return None
-            if len(digits) == 6:      # HHMMSS
-                hh, mm, ss = digits[:2], digits[2:4], digits[4:6]
-            elif len(digits) == 4:    # HHMM
-                hh, mm, ss = digits[:2], digits[2:4], "00"
-            elif len(digits) == 3:    # HMM
-                hh, mm, ss = digits[:1], digits[1:3], "00"
-            elif len(digits) == 2:    # HH
-                hh, mm, ss = digits, "00", "00"
-            elif len(digits) == 1:    # H
-                hh, mm, ss = digits, "00", "00"
-            else:
-                return None
-        else:
-            if len(parts) == 2:
-                hh, mm = parts
-                ss = "00"
-            else:
-                hh, mm, ss = parts[0], parts[1], parts[2]
+        # find date (prefer YMD if present, else DMY)
+        ymd = txt.str.extract(self._YMD)
+        dmy = txt.str.extract(self._DMY)
+        if not dayfirst:
+            dmy = dmy.rename(columns={"d": "m", "m": "d"})
+        use_ymd = ymd["y"].notna()
+        has_date = use_ymd | dmy["y"].notna()
+
+        def _part(name: str) -> pd.Series:
+            return pd.to_numeric(ymd[name].where(use_ymd, dmy[name])).astype("Int64")
+
+        d, mo, y = _part("d"), _part("m"), _part("y")
+        # 2-digit years heuristic: 00-69 -> 2000-2069, 70-99 -> 1970-1999
+        y = y.mask(y < 100, y + 1900).mask(y <= 69, y + 2000)
 
-        try:
-            h = int(hh); m = int(mm); s = int(ss)
-        except Exception:
-            return None
+        def _pad(x: pd.Series, width: int) -> pd.Series:
+            return x.astype("string").str.zfill(width)
 
-        if not (0 <= h <= 23 and 0 <= m <= 59 and 0 <= s <= 59):
-            return None
+        dates = _pad(y, 4) + "-" + _pad(mo, 2) + "-" + _pad(d, 2)
+
+        # remove date part, then find time in the remainder
+        rest = txt.str.replace(self._DMY, " ", n=1, regex=True).where(
+            ~use_ymd, txt.str.replace(self._YMD, " ", n=1, regex=True)
+        )
+        # generic separators between date/time (comma, T, semicolon, multiple spaces...)
+        rest = rest.str.replace(r"[T,;|]+", " ", regex=True)
+        rest = rest.str.replace(r"\s+", " ", regex=True).str.strip()
 
-        return f"{h:02d}:{m:02d}:{s:02d}"
+        tm = rest.str.extract(self._TIME)
+        # fallback: attempt to normalize whatever is left (digits-only etc.)
+        hour_txt = (tm["h"] + ":" + tm["mi"] + ":" + tm["s"].fillna("00")).fillna(rest)
+        hours = _to_hhmmss(hour_txt).where(has_date)
+
+        return dates.astype("string"), hours
 
     def extract_date_and_hour(self) -> float:
         """
@@ -319,50 +423,32 @@ class Preference_SingleDateTime:
             )
 
         s_str = s.astype("string")
-        dates = []
-        hours = []
-
-        for v in s_str.tolist():
-            if pd.isna(v):
-                dates.append(pd.NA)
-                hours.append(pd.NA)
-                continue
-
-            txt = str(v).strip()
-
-            # find date (prefer YMD if present, else DMY)
-            dm = self._YMD.search(txt) or self._DMY.search(txt)
-            if not dm:
-                dates.append(pd.NA)
-                hours.append(pd.NA)
-                continue
-
-            d = int(dm.group("d"))
-            mo = int(dm.group("m"))
-            y = self._century_fix(int(dm.group("y")))
-            date_norm = f"{y:04d}-{mo:02d}-{d:02d}"
-
-            # remove date part, then find time in the remainder
-            rest = (txt[: dm.start()] + " " + txt[dm.end() :]).strip()
-            # generic separators between date/time (comma, T, semicolon, multiple spaces...)
-            rest = re.sub(r"[T,;|]+", " ", rest)
-            rest = re.sub(r"\s+", " ", rest).strip()
-
-            tm = self._TIME.search(rest)
-            if tm:
-                h = tm.group("h")
-                mi = tm.group("mi")
-                sec = tm.group("s") or "00"
-                hour_norm = self._to_hhmmss(f"{h}:{mi}:{sec}")
-            else:
-                # fallback: attempt to normalize whatever is left (digits-only etc.)
-                hour_norm = self._to_hhmmss(rest)
-
-            dates.append(date_norm if date_norm else pd.NA)
-            hours.append(hour_norm if hour_norm else pd.NA)
-
-        self.table[self.date_col_out] = pd.Series(dates, index=self.table.index, dtype="string")
-        self.table[self.hour_col_out] = pd.Series(hours, index=self.table.index, dtype="string")
+
+        # Fast path: vectorized parse with explicit formats, then format="mixed".
+        # Only rows with a numeric date are trusted here; the lenient parser would
+        # otherwise turn time-only values into today's date.
+        has_date = s_str.str.contains(self._YMD) | s_str.str.contains(self._DMY)
+        has_date = has_date.fillna(False).astype(bool)
+        # Day/month order is decided once for the column (see _date_order);
+        # rows contradicting it stay NaT instead of being read the other way round
+        dayfirst, wrong = _date_order(s_str)
+        has_date = has_date & ~wrong
+        formats = _formats_for_order(self.CANDIDATE_FORMATS, dayfirst)
+        parsed = _to_datetime_by_formats(s_str.where(has_date), formats, dayfirst=dayfirst)
+
+        dates = parsed.dt.strftime("%Y-%m-%d").astype("string")
+        hours = parsed.dt.strftime("%H:%M:%S").astype("string")
+
+        # Fallback: regex extraction for dated rows the vectorized parse rejects
+        # (e.g. "01.01.2024 00.15" with '.' as time separator)
+        fallback = (has_date & parsed.isna()).to_numpy()
+        if fallback.any():
+            fb_dates, fb_hours = self._extract_parts(s_str[fallback].str.strip(), dayfirst)
+            dates[fallback] = fb_dates.to_numpy()
+            hours[fallback] = fb_hours.to_numpy()
+
+        self.table[self.date_col_out] = dates
+        self.table[self.hour_col_out] = hours
 
         ok = self.table[self.date_col_out].notna() & self.table[self.hour_col_out].notna()
         return float(ok.mean()) if len(s_str) else 0.0
@@ -372,14 +458,28 @@ class Preference_SingleDateTime:
         Combine date_norm + hour_norm into self.out_col as datetime64[ns] (tz-naive).
         Returns parse success rate (0..1).
         """
+        src = self.table.get(self.datetime_col)
+        if src is not None and pd.api.types.is_datetime64_any_dtype(src):
+            # Already datetime: skip the strftime -> to_datetime round trip.
+            # Same result: wall-clock time, truncated to whole seconds.
+            dt = src
+            if dt.dt.tz is not None:
+                dt = dt.dt.tz_localize(None)
+            dt = dt.dt.floor("s").astype("datetime64[ns]")
+
+            self.table[self.out_col] = dt
+            return float(dt.notna().mean()) if len(dt) else 0.0
+
         if self.date_col_out not in self.table.columns or self.hour_col_out not in self.table.columns:
             _ = self.extract_date_and_hour()
 
         date_s = self.table[self.date_col_out].astype("string")
         hour_s = self.table[self.hour_col_out].astype("string")
 
-        combined = (date_s + " " + hour_s).astype("string")
-        dt = pd.to_datetime(combined, errors="coerce", format="%Y-%m-%d %H:%M:%S")
+        # date + hour offset, no joined strings (see Preference_Date_And_Hour)
+        dates = pd.to_datetime(date_s, errors="coerce", format="%Y-%m-%d", cache=True)
+        hours = pd.to_datetime(hour_s, errors="coerce", format="%H:%M:%S", cache=True)
+        dt = dates + (hours - pd.Timestamp("1900-01-01"))
 
         self.table[self.out_col] = dt
         return float(dt.notna().mean()) if len(dt) else 0.0
@@ -24,6 +24,10 @@ class HeaderDetector:
         "wirkleistung",
     ]
 
+    # Header rows sit above the data, so only the top of the table is scanned.
+    # A report preamble is a few lines; 100 rows leaves plenty of margin.
+    MAX_SCAN_ROWS = 100
+
     def __init__(self, table: pd.DataFrame) -> None:
         """
         Parameters
@@ -48,7 +52,7 @@ class HeaderDetector:
 
     def find_header_row(self) -> int:
         """
-        Scan all rows and return the index of the row
+        Scan the first ``MAX_SCAN_ROWS`` rows and return the index of the row
         that looks most like a header.
 
         A row is scored based on whether it contains any
@@ -66,10 +70,14 @@ class HeaderDetector:
         """
         best_row: Optional[int] = None
         best_score = 0
+        max_score = 2  # one time hit + one consumption hit
+
+        # Only the head is scanned; the chosen index is applied to the full table
+        head = self.table.iloc[: self.MAX_SCAN_ROWS]
 
-        for i in range(len(self.table)):
+        for i, row in enumerate(head.itertuples(index=False, name=None)):
             # Normalize all values in this row
-            row_vals = [self._norm(v) for v in self.table.iloc[i]]
+            row_vals = [self._norm(v) for v in row]
 
             # Join them into a single string for simple substring search
             row_text = " | ".join(row_vals)
@@ -85,6 +93,11 @@ class HeaderDetector:
                 best_score = score
                 best_row = i
 
+                # Only a strictly higher score replaces the best row, so the first
+                # row with both hits wins: no need to scan the rest of the head.
+                if best_score == max_score:
+                    break
+
         if best_row is None:
             raise ValueError("Header row could not be detected in the DataFrame.")
 
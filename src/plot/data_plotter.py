@@ -17,31 +17,91 @@ class DataPlotter:
       - plot_random_week() -> dict(fig, week_index, start, end, total_weeks)
     """
 
+    # Full-range plot: above this many points, draw a min/max-per-bucket subset
+    DOWNSAMPLE_THRESHOLD = 3000
+    DOWNSAMPLE_POINTS = 2000
+
     def __init__(self, dataframe: pd.DataFrame):
-        self.df = dataframe.copy()
+        # No up-front copy: _prepare builds its own frame from the two columns,
+        # so the caller's table is never modified
+        self.df = dataframe
+        # Figure reused by plot_random_week (created on first use)
+        self._random_fig = None
         self._prepare()
 
     def _prepare(self) -> None:
         if "moment" not in self.df.columns or "consumption_kwh" not in self.df.columns:
             raise ValueError("Data must contain columns: 'moment' and 'consumption_kwh'.")
 
-        self.df["moment"] = pd.to_datetime(self.df["moment"], errors="coerce")
-        self.df["consumption_kwh"] = pd.to_numeric(self.df["consumption_kwh"], errors="coerce")
-
-        self.df = self.df.dropna(subset=["moment", "consumption_kwh"]).sort_values("moment")
-
-        # Week grouping: Monday->Sunday weeks (pandas default 'W' ends on Sunday)
-        self.df["_week_start"] = self.df["moment"].dt.to_period("W").apply(lambda p: p.start_time)
-
-        self._weeks_sorted = sorted(self.df["_week_start"].dropna().unique().tolist())
-        self._week_to_index = {ws: i + 1 for i, ws in enumerate(self._weeks_sorted)}
+        self.df = pd.DataFrame(
+            {
+                "moment": pd.to_datetime(self.df["moment"], errors="coerce"),
+                # float32 is plenty for drawing and halves the plotter's copy of the values
+                # (the table itself, and what gets saved, keeps full precision)
+                "consumption_kwh": pd.to_numeric(
+                    self.df["consumption_kwh"], errors="coerce"
+                ).astype("float32"),
+            }
+        )
+
+        self.df = self.df.dropna(subset=["moment", "consumption_kwh"])
+        # Meter exports are normally already in time order: only sort when needed
+        # (stable, so rows with the same moment keep their order either way)
+        if not self.df["moment"].is_monotonic_increasing:
+            self.df = self.df.sort_values("moment", kind="mergesort")
+
+        # Week grouping: Monday->Sunday weeks (pandas default 'W' ends on Sunday).
+        # Floor to Monday 00:00 arithmetically: same as to_period("W").start_time,
+        # without building a Period object per row.
+        m = self.df["moment"]
+        self.df["_week_start"] = (m - pd.to_timedelta(m.dt.weekday, unit="D")).dt.normalize()
+
+        # Rows are sorted by moment, so each week is one contiguous run of rows:
+        # keep the week starts as a sorted array for binary-search slicing.
+        self._week_start_values = self.df["_week_start"].to_numpy(dtype="datetime64[ns]")
+
+        # The array is non-decreasing: distinct weeks start where the value changes
+        # (no hash-unique + sort over all rows)
+        vals = self._week_start_values
+        is_first = np.ones(len(vals), dtype=bool)
+        is_first[1:] = vals[1:] != vals[:-1]
+        self._weeks = pd.DatetimeIndex(vals[is_first])
+        self._weeks_sorted = self._weeks.tolist()
 
     def total_weeks(self) -> int:
         return len(self._weeks_sorted)
 
+    @staticmethod
+    def _minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+        """
+        Row positions keeping the min and max of each of ~n_out/2 equal buckets
+        (plus the first/last point), so peaks and dips survive downsampling.
+        """
+        n = len(y)
+        bucket = int(np.ceil(n / (n_out // 2)))
+        n_buckets = int(np.ceil(n / bucket))
+
+        padded = np.full(n_buckets * bucket, np.nan)
+        padded[:n] = y
+        padded = padded.reshape(n_buckets, bucket)
+
+        offsets = np.arange(n_buckets) * bucket
+        idx = np.concatenate([
+            offsets + np.nanargmin(padded, axis=1),
+            offsets + np.nanargmax(padded, axis=1),
+            [0, n - 1],
+        ])
+        return np.unique(idx)
+
     def plot_full(self):
+        x = self.df["moment"].to_numpy()
+        y = self.df["consumption_kwh"].to_numpy(dtype=np.float64)
+        if len(y) > self.DOWNSAMPLE_THRESHOLD:
+            idx = self._minmax_indices(y, self.DOWNSAMPLE_POINTS)
+            x, y = x[idx], y[idx]
+
         fig, ax = plt.subplots(figsize=(10, 5))
-        ax.plot(self.df["moment"], self.df["consumption_kwh"], label="Full Data")
+        ax.plot(x, y, label="Full Data")
         ax.set_xlabel("Moment")
         ax.set_ylabel("Consumption (kWh)")
         ax.set_title("Full time range")
@@ -49,17 +109,38 @@ class DataPlotter:
         fig.autofmt_xdate()
         return fig
 
-    def _plot_week_start(self, week_start: pd.Timestamp):
-        week_data = self.df[self.df["_week_start"] == week_start].copy()
+    def _random_week_axes(self):
+        """
+        Figure/axes for plot_random_week: each new random week clears and redraws
+        the same figure instead of building another one. A new figure is made
+        if the previous one was closed (plt.close) in the meantime.
+        """
+        fig = self._random_fig
+        if fig is None or not plt.fignum_exists(fig.number):
+            fig, ax = plt.subplots(figsize=(10, 5))
+            self._random_fig = fig
+            return fig, ax
+        ax = fig.axes[0]
+        ax.clear()
+        return fig, ax
+
+    def _plot_week_start(self, week_start: pd.Timestamp, axes=None):
+        ws = np.datetime64(pd.Timestamp(week_start), "ns")
+        lo = np.searchsorted(self._week_start_values, ws, side="left")
+        hi = np.searchsorted(self._week_start_values, ws, side="right")
+        week_data = self.df.iloc[lo:hi]
         if week_data.empty:
             raise ValueError("Selected week has no data to plot.")
 
-        fig, ax = plt.subplots(figsize=(10, 5))
+        fig, ax = axes() if axes is not None else plt.subplots(figsize=(10, 5))
         ax.plot(week_data["moment"], week_data["consumption_kwh"], label="Weekly Data")
         ax.set_xlabel("Moment")
         ax.set_ylabel("Consumption (kWh)")
 
-        week_index = self._week_to_index.get(week_start, None)
+        try:
+            week_index = self._weeks.get_loc(pd.Timestamp(week_start)) + 1
+        except KeyError:
+            week_index = None
         ax.set_title(f"Week {week_index} / {self.total_weeks()}")
         ax.legend()
         fig.autofmt_xdate()
@@ -85,6 +166,8 @@ class DataPlotter:
     def plot_random_week(self):
         if not self._weeks_sorted:
             raise ValueError("No weekly segments found in the dataset.")
-        rng = np.random.default_rng()
-        random_week_start = rng.choice(self._weeks_sorted)
-        return self._plot_week_start(random_week_start)
+        # Draw a position instead of rng.choice over the list, which would first
+        # turn the Timestamps into an object array
+        i = np.random.default_rng().integers(len(self._weeks_sorted))
+        random_week_start = self._weeks_sorted[i]
+        return self._plot_week_start(random_week_start, axes=self._random_week_axes)
@@ -0,0 +1,37 @@
+import unittest
+
+import pandas as pd
+
+from src.data_core.adjustments import TableRefiner
+from src.intelligence.columns import ConsumptionColumnDetector
+
+
+class ConsumptionOnArrowStringsTest(unittest.TestCase):
+    """Detection must not change once text columns are Arrow strings."""
+
+    def _arrow_table(self, data: dict) -> pd.DataFrame:
+        refiner = TableRefiner(pd.DataFrame(data, dtype=object))
+        return refiner.convert_to_arrow_dtypes()
+
+    def test_text_kwh_column_before_real_one_is_not_picked(self):
+        table = self._arrow_table(
+            {
+                "status kwh": ["ok"] * 4,
+                "verbrauch kwh": ["1.5", "2.0", "2.5", "3.0"],
+            }
+        )
+        det = ConsumptionColumnDetector(table)
+
+        self.assertEqual(det.detect_consumption_column(), "verbrauch kwh")
+        self.assertEqual(det.to_kwh().tolist(), [1.5, 2.0, 2.5, 3.0])
+
+    def test_all_text_consumption_column_raises(self):
+        table = self._arrow_table({"verbrauch kwh": ["n/a"] * 4})
+        det = ConsumptionColumnDetector(table)
+
+        with self.assertRaisesRegex(ValueError, "cannot be converted to numeric"):
+            det.to_kwh()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import pandas as pd
+
+from src.intelligence.columns.time import Preference_Date_And_Hour, Preference_SingleDateTime
+
+
+class MonthFirstDatesTest(unittest.TestCase):
+    """Day/month order is decided once per column, not row by row."""
+
+    EXPECTED = [
+        pd.Timestamp("2024-01-12 00:15"),
+        pd.Timestamp("2024-01-13 00:15"),
+        pd.Timestamp("2024-01-14 00:15"),
+    ]
+
+    def test_single_column(self):
+        table = pd.DataFrame(
+            {"zeit": ["01/12/2024 00:15", "01/13/2024 00:15", "01/14/2024 00:15"]}
+        )
+        pref = Preference_SingleDateTime(table, datetime_col="zeit")
+        pref.extract_date_and_hour()
+        pref.create_moment_column()
+
+        self.assertEqual(pref.table["moment"].tolist(), self.EXPECTED)
+
+    def test_date_and_hour(self):
+        table = pd.DataFrame(
+            {
+                "datum": ["01/12/2024", "01/13/2024", "01/14/2024"],
+                "uhrzeit": ["00:15", "00:15", "00:15"],
+            }
+        )
+        pref = Preference_Date_And_Hour(table, date_col="datum", hour_col="uhrzeit")
+        pref.detect_date_dtype()
+        pref.normalize_hour_column()
+        pref.create_moment_column()
+
+        self.assertEqual(pref.table["moment"].tolist(), self.EXPECTED)
+
+    def test_row_contradicting_column_order_is_nat(self):
+        table = pd.DataFrame({"zeit": ["13/01/2024 00:15", "01/13/2024 00:15"]})
+        pref = Preference_SingleDateTime(table, datetime_col="zeit")
+        pref.extract_date_and_hour()
+        pref.create_moment_column()
+
+        moment = pref.table["moment"]
+        self.assertEqual(moment.iloc[0], pd.Timestamp("2024-01-13 00:15"))
+        self.assertTrue(pd.isna(moment.iloc[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()